@@ -4,6 +4,7 @@ import time
 import os
 import re
 import psutil
+from concurrent.futures import ThreadPoolExecutor
 
 def is_process_running(process_name, script_path=None):
     """
@@ -97,16 +98,83 @@ def wait_for_any_file_in_folder(folder_path, timeout=600, check_interval=5):
     return False
 
 
+def _scan_subtree_for_files(folder_path, target_filenames, depth, max_depth, prune_pattern):
+    """
+    Обходит поддерево folder_path через os.scandir и возвращает список
+    (имя файла, полный путь) для файлов из target_filenames.
+    Папки, имена которых совпадают с prune_pattern, и уровни глубже max_depth пропускаются.
+    """
+    found = []
+    stack = [(folder_path, depth)]
+    while stack:
+        current_path, current_depth = stack.pop()
+        try:
+            with os.scandir(current_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if max_depth is not None and current_depth >= max_depth:
+                            continue
+                        if prune_pattern and re.fullmatch(prune_pattern, entry.name):
+                            continue
+                        stack.append((entry.path, current_depth + 1))
+                    elif entry.name in target_filenames:
+                        found.append((entry.name, entry.path))
+        except OSError as e:
+            # Как и os.walk, пропускаем недоступные папки
+            print(f"Не удалось прочитать папку '{current_path}': {e}")
+    return found
+
+def scan_tree_for_files(root_folder, target_filenames, max_depth=None, prune_pattern=None, max_workers=4):
+    """
+    Ищет файлы с именами из target_filenames в root_folder и его подпапках.
+    Подпапки первого уровня обходятся параллельно в max_workers потоках.
+    max_depth ограничивает глубину вложенности (0 - только сама root_folder, None - без ограничений),
+    prune_pattern - регулярное выражение для имен папок, которые не нужно обходить.
+    Возвращает словарь {имя файла: [полные пути]}.
+    """
+    target_filenames = set(target_filenames)
+    results = {filename: [] for filename in target_filenames}
+    subtrees = []
+
+    try:
+        with os.scandir(root_folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if max_depth is not None and max_depth < 1:
+                        continue
+                    if prune_pattern and re.fullmatch(prune_pattern, entry.name):
+                        continue
+                    subtrees.append(entry.path)
+                elif entry.name in target_filenames:
+                    results[entry.name].append(entry.path)
+    except OSError as e:
+        # Как и os.walk, для недоступной папки просто ничего не находим
+        print(f"Не удалось прочитать папку '{root_folder}': {e}")
+        return results
+
+    if subtrees:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_scan_subtree_for_files, subtree, target_filenames, 1, max_depth, prune_pattern)
+                for subtree in subtrees
+            ]
+            for future in futures:
+                for filename, path in future.result():
+                    results[filename].append(path)
+    return results
+
+
 def get_telegram_checker_folders(base_path, folder_name_pattern):
     """
     Возвращает список полных путей к папкам 'Telegram Checker [время]' в заданной директории.
     """
     folders = []
     try:
-        for item in os.listdir(base_path):
-            item_path = os.path.join(base_path, item)
-            if os.path.isdir(item_path) and re.fullmatch(folder_name_pattern, item):
-                folders.append(item_path)
+        with os.scandir(base_path) as it:
+            for entry in it:
+                # DirEntry.is_dir() использует тип из результата scandir без лишнего stat
+                if entry.is_dir() and re.fullmatch(folder_name_pattern, entry.name):
+                    folders.append(entry.path)
     except Exception as e:
         print(f"Ошибка при получении списка папок Telegram Checker: {e}")
     return folders
@@ -165,10 +233,12 @@ def find_latest_new_telegram_checker_folder(base_path, folder_name_pattern, init
     return None
 
 
-def find_and_move_work_chats(source_folder, destination_folder, filename_to_find="Work_Chats_Statistics.txt"):
+def find_and_move_work_chats(source_folder, destination_folder, filename_to_find="Work_Chats_Statistics.txt",
+                             max_depth=None, prune_pattern=None, max_workers=4):
     """
     Ищет и перемещает файлы filename_to_find из source_folder (и его подпапок)
     в destination_folder. Возвращает количество перемещенных файлов.
+    max_depth, prune_pattern и max_workers передаются в scan_tree_for_files.
     """
     moved_count = 0
     print(f"Поиск и перемещение '{filename_to_find}' из '{source_folder}' и его подпапок в '{destination_folder}'...")
@@ -176,19 +246,27 @@ def find_and_move_work_chats(source_folder, destination_folder, filename_to_find
         # Убедимся, что папка назначения существует
         os.makedirs(destination_folder, exist_ok=True)
 
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file == filename_to_find:
-                    source_path = os.path.join(root, file)
-                    destination_path = os.path.join(destination_folder, file)
-                    
-                    if os.path.exists(destination_path):
-                        base, ext = os.path.splitext(file)
-                        destination_path = os.path.join(destination_folder, f"{base}_{int(time.time())}{ext}")
-                    
-                    shutil.move(source_path, destination_path)
-                    print(f"Файл '{file}' перемещен из '{root}' в '{destination_folder}'.")
-                    moved_count += 1
+        found_files = scan_tree_for_files(source_folder, [filename_to_find], max_depth=max_depth,
+                                          prune_pattern=prune_pattern, max_workers=max_workers)
+        # Сортируем пути, чтобы порядок перемещения не зависел от порядка обхода потоками
+        for source_path in sorted(found_files[filename_to_find]):
+            file = os.path.basename(source_path)
+            root = os.path.dirname(source_path)
+            destination_path = os.path.join(destination_folder, file)
+            
+            if os.path.exists(destination_path):
+                base, ext = os.path.splitext(file)
+                timestamp = int(time.time())
+                destination_path = os.path.join(destination_folder, f"{base}_{timestamp}{ext}")
+                # Счетчик исключает совпадение имен для файлов, перемещенных в одну и ту же секунду
+                counter = 1
+                while os.path.exists(destination_path):
+                    destination_path = os.path.join(destination_folder, f"{base}_{timestamp}_{counter}{ext}")
+                    counter += 1
+            
+            shutil.move(source_path, destination_path)
+            print(f"Файл '{file}' перемещен из '{root}' в '{destination_folder}'.")
+            moved_count += 1
         return moved_count
     except Exception as e:
         print(f"Ошибка при поиске/перемещении '{filename_to_find}': {e}")
@@ -315,6 +393,9 @@ PRIVATE_CHAT_FILE_PATTERN = r"[а-яА-ЯёЁa-zA-Z]+_(\d+)_приватных(?
 PUBLIC_CHAT_FILE_PATTERN = r"[а-яА-ЯёЁa-zA-Z]+_(\d+)_публичных(?:\s\(\d+\))?\.txt"
 TELEGRAM_CHECKER_FOLDER_PATTERN = r"Telegram Checker \[\d{2}\.\d{2}\.\d{2}\]"
 WORK_CHATS_STATISTICS_FILE = "Work_Chats_Statistics.txt"
+WORK_CHATS_SCAN_MAX_DEPTH = None # Максимальная глубина поиска Work_Chats_Statistics.txt (None - без ограничений)
+WORK_CHATS_SCAN_PRUNE_PATTERN = None # Паттерн имен папок, которые не нужно обходить (None - обходить все)
+WORK_CHATS_SCAN_WORKERS = 4 # Количество потоков для параллельного обхода подпапок
 
 FILTER_PASSED_FILE = r"прошли\.txt"
 FILTER_NOT_PASSED_FILE_PATTERN = r"не_прошли\d*\.txt" 
@@ -436,7 +517,14 @@ print(f"Найдена последняя новая папка: '{os.path.basen
 
 # 6. Поиск и перемещение Work_Chats_Statistics.txt и безусловное удаление папки Telegram Checker [время]
 print("\nШаг 6: Поиск и перемещение 'Work_Chats_Statistics.txt' (вырезание) и удаление папки 'Telegram Checker [время]'...")
-total_moved_work_chats = find_and_move_work_chats(current_telegram_checker_folder, UNPROCESSED_FOLDER_3, WORK_CHATS_STATISTICS_FILE)
+total_moved_work_chats = find_and_move_work_chats(
+    current_telegram_checker_folder,
+    UNPROCESSED_FOLDER_3,
+    WORK_CHATS_STATISTICS_FILE,
+    max_depth=WORK_CHATS_SCAN_MAX_DEPTH,
+    prune_pattern=WORK_CHATS_SCAN_PRUNE_PATTERN,
+    max_workers=WORK_CHATS_SCAN_WORKERS
+)
 
 if total_moved_work_chats == 0:
     print(f"Шаг 6: Внимание: Файлы '{WORK_CHATS_STATISTICS_FILE}' не были найдены и перемещены из '{os.path.basename(current_telegram_checker_folder)}'. Скрипт завершает работу.")